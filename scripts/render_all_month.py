@@ -1,5 +1,8 @@
-import subprocess
-import sys
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
 import pandas as pd
@@ -8,28 +11,78 @@ ROOT = Path(__file__).resolve().parents[1]
 GOLD = ROOT / "data" / "gold" / "constructor_monthly.parquet"
 CHARTS = ROOT / "reports" / "charts"
 REPORTS = ROOT / "reports"
-CHARTS.mkdir(parents=True, exist_ok=True)
-REPORTS.mkdir(parents=True, exist_ok=True)
-
-# Load months present in gold
-g = pd.read_parquet(GOLD)
-months = (
-    g["m"].dt.strftime("%Y-%m")
-    .drop_duplicates()
-    .sort_values()
-    .tolist()
-)
-
-# Render a Top-10 PNG for every available month using a report module
-for ym in months:
-    subprocess.run(
-        [sys.executable, "-m", "src.tracker.report", "--month", ym, "--top", "10"],
-        check=True
-    )
-
-# Build a tiny dropdown HTML that swaps the image by month
-options_js = ",".join([f"'{m}'" for m in months])
-html = f"""
+
+
+def month_labels(g: pd.DataFrame) -> list[str]:
+    """Sorted 'YYYY-MM' labels for every month present in gold."""
+    return g["m"].dt.strftime("%Y-%m").drop_duplicates().sort_values().tolist()
+
+
+def render_plotly(top: int = 10) -> int:
+    """Writes one index.html that embeds gold and lets plotly.js draw any month in the browser."""
+    g = pd.read_parquet(GOLD, columns=["m", "constructor_name", "points_m"])
+    g["m"] = pd.to_datetime(g["m"])
+    months = month_labels(g)
+    g["m"] = g["m"].dt.strftime("%Y-%m")
+
+    # Compact [month, constructor_name, points_m] rows; embedded inline so the page also works from file://
+    rows_js = g.to_json(orient="values")
+    options_js = json.dumps(months)
+    html = f"""
+<!doctype html>
+<html>
+  <head>
+    <meta charset="utf-8"><title>F1 Top-{top} by Month</title>
+    <script src="https://cdn.plot.ly/plotly-2.35.2.min.js"></script>
+  </head>
+  <body>
+    <label for="m">Month:</label>
+    <select id="m"></select>
+    <br/><br/>
+    <div id="chart" style="width:900px;height:560px;"></div>
+    <script>
+      const rows={rows_js};
+      const months={options_js};
+      const sel=document.getElementById('m');
+      months.forEach(x=>{{const o=document.createElement('option');o.value=x;o.textContent=x;sel.appendChild(o);}});
+      function set(x){{
+        // Top-{top} by points; reversed so the biggest bar appears at the top.
+        const sub=rows.filter(r=>r[0]===x&&r[2]!==null).sort((a,b)=>b[2]-a[2]).slice(0,{top}).reverse();
+        Plotly.react('chart',
+          [{{type:'bar',orientation:'h',x:sub.map(r=>r[2]),y:sub.map(r=>r[1])}}],
+          {{title:{{text:'Top {top} Constructors — '+x}},xaxis:{{title:{{text:'Points in Month'}}}},margin:{{l:200}}}});
+        sel.value=x;
+      }}
+      set(months[months.length-1]); // default to latest month
+      sel.onchange=()=>set(sel.value);
+    </script>
+  </body>
+</html>
+"""
+    (REPORTS / "index.html").write_text(html, encoding="utf-8")
+    return len(months)
+
+
+def render_png(top: int = 10) -> int:
+    """Renders one matplotlib PNG per month and an index.html that swaps the image by month."""
+    # Imported here so the default plotly mode never loads matplotlib.
+    from src.tracker.report import load_gold, render_one
+
+    CHARTS.mkdir(parents=True, exist_ok=True)
+
+    # Load months present in gold (cached, so forked workers inherit it instead of re-reading)
+    g = load_gold(GOLD)
+    months = month_labels(g)
+
+    # Render a PNG for every available month; months are independent, so spread them over all cores
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        render = partial(render_one, gold_path=GOLD, charts_dir=CHARTS, top=top)
+        list(ex.map(render, months, chunksize=max(1, len(months) // (4 * workers))))
+
+    # Build a tiny dropdown HTML that swaps the image by month
+    options_js = json.dumps(months)
+    html = f"""
 <!doctype html>
 <html>
   <head><meta charset="utf-8"><title>F1 Top-10 by Month</title></head>
@@ -39,7 +92,7 @@ html = f"""
     <br/><br/>
     <img id="chart" width="900"/>
     <script>
-      const months=[{options_js}];
+      const months={options_js};
       const sel=document.getElementById('m');
       months.forEach(x=>{{const o=document.createElement('option');o.value=x;o.textContent=x;sel.appendChild(o);}});
       function set(x){{document.getElementById('chart').src='charts/top10_'+x+'.png'; sel.value=x;}}
@@ -49,7 +102,24 @@ html = f"""
   </body>
 </html>
 """
-(REPORTS / "index.html").write_text(html, encoding="utf-8")
+    (REPORTS / "index.html").write_text(html, encoding="utf-8")
+    print("Rendered", len(months), "charts into", CHARTS)
+    return len(months)
+
+
+def main() -> None:
+    # Parses CLI flags: --png renders static matplotlib charts instead of the plotly page
+    p = argparse.ArgumentParser()
+    p.add_argument("--png", action="store_true", help="render one PNG per month with matplotlib")
+    args = p.parse_args()
+
+    REPORTS.mkdir(parents=True, exist_ok=True)
+    n_months = render_png() if args.png else render_plotly()
+
+    print("Months:", n_months)
+    print("Open:", REPORTS / "index.html")
+
 
-print("Rendered", len(months), "charts into", CHARTS)
-print("Open:", REPORTS / "index.html")
+# Guarded so process-pool workers started with "spawn" (macOS/Windows) don't re-run the script.
+if __name__ == "__main__":
+    main()
@@ -63,7 +63,7 @@ def build_bronze(races: Path, cons: Path, cons_results: Path) -> pd.DataFrame:
 
 def save_parquet(df: pd.DataFrame, out_path: Path) -> None:
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(out_path, index=False)
+    df.to_parquet(out_path, index=False, compression="zstd", compression_level=3)
 
 
 if __name__ == "__main__":
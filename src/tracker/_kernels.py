@@ -0,0 +1,38 @@
+from __future__ import annotations
+import numpy as np
+
+# numba is optional: without it callers stay on the NumPy datetime64[M] cast.
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+NS_PER_DAY = 86_400 * 1_000_000_000
+NAT = np.iinfo(np.int64).min  # datetime64 NaT as int64
+
+
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _days_into_month(days: int) -> int:
+        """Day-of-month minus one for a day count since 1970-01-01 (proleptic Gregorian, exact integer math)."""
+        z = days + 719_468
+        era = z // 146_097
+        doe = z - era * 146_097
+        yoe = (doe - doe // 1_460 + doe // 36_524 - doe // 146_096) // 365
+        doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+        mp = (5 * doy + 2) // 153
+        return doy - (153 * mp + 2) // 5
+
+    @njit(parallel=True, cache=True)
+    def floor_to_month_ns(ns: np.ndarray, out: np.ndarray) -> None:
+        """Writes the first-of-month (in ns since epoch) of every int64 timestamp in ns into out. NaT stays NaT."""
+        for i in prange(ns.shape[0]):
+            v = ns[i]
+            if v == NAT:
+                out[i] = NAT
+            else:
+                days = v // NS_PER_DAY
+                out[i] = (days - _days_into_month(days)) * NS_PER_DAY
+else:
+    floor_to_month_ns = None
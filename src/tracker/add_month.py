@@ -1,63 +1,175 @@
 from __future__ import annotations
+from collections.abc import Iterator
 from pathlib import Path
+import argparse
+import shutil
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.tracker._kernels import HAVE_NUMBA, floor_to_month_ns
 
 ROOT = Path(__file__).resolve().parents[2]
 BRONZE = ROOT / "data" / "bronze"
 INP = BRONZE / "race_constructor_points.parquet"
 OUT = BRONZE / "race_constructor_points_with_month.parquet"
 OUT_PARTITIONED = BRONZE / "by_month"
+NUMBA_MIN_ROWS = 1_000_000  # below this the JIT warmup costs more than the parallel kernel saves
+STREAM_MIN_ROWS = 5_000_000  # above this main() streams batches instead of loading bronze whole
+BRONZE_COLUMNS = ["race_id", "race_date", "constructor_id", "constructor_name", "points"]
 
 
 def load_bronze(path: Path) -> pd.DataFrame:
-    df = pd.read_parquet(path)
-    expected = {"race_id", "race_date", "constructor_id", "constructor_name", "points"}
-    missing = expected - set(df.columns)
-    assert not missing, f"Missing columns: {missing}"
-    return df
+    # Only the needed column chunks are decoded; a missing column raises inside pyarrow.
+    # Arrow-backed dtypes keep strings as string[pyarrow] instead of Python objects.
+    return pd.read_parquet(path, columns=BRONZE_COLUMNS, engine="pyarrow", dtype_backend="pyarrow")
+
 
+def load_bronze_batches(path: Path, batch_size: int = 200_000) -> Iterator[pa.RecordBatch]:
+    """Yields bronze as record batches; peak memory is bounded by batch_size rather than file size."""
+    yield from ds.dataset(path, format="parquet").to_batches(columns=BRONZE_COLUMNS, batch_size=batch_size)
 
-def add_month_col(df: pd.DataFrame) -> pd.DataFrame:
+
+def add_month_col(df: pd.DataFrame, inplace: bool = True) -> pd.DataFrame:
     """
+    Adds the month column 'm' (first day of month, datetime64[ns]).
+    Mutates df unless inplace=False, in which case a copy is modified and returned.
 
     :type df: pd.DataFrame
     """
+    df = df if inplace else df.copy()
     if not pd.api.types.is_datetime64_any_dtype(df["race_date"]):
         df["race_date"] = pd.to_datetime(df["race_date"], errors="raise")
 
     if getattr(df["race_date"].dt, "tz", None) is not None:
         df["race_date"] = df["race_date"].dt.tz_localize(None)
 
-    m = df["race_date"].dt.to_period("M").dt.to_timestamp(how="start")
-    df["m"] = m
+    ns = df["race_date"].to_numpy("datetime64[ns]")
+    if HAVE_NUMBA and len(df) > NUMBA_MIN_ROWS:
+        out = np.empty(len(ns), dtype="int64")
+        floor_to_month_ns(np.ascontiguousarray(ns).view("int64"), out)
+        df["m"] = out.view("datetime64[ns]")
+    else:
+        # Truncating to datetime64[M] floors to the month start without a Period round-trip.
+        df["m"] = ns.astype("datetime64[M]").astype("datetime64[ns]")
 
     assert pd.api.types.is_datetime64_any_dtype(df["m"]), "m must be datetime64[ns]"
-    assert (df["m"].dt.day == 1).all(), "m must be the first day of the month"
+    # O(1) sanity check; the datetime64[M] floor already guarantees day 1 for every row.
+    assert df.empty or (df["m"].iloc[0].day == 1 and df["m"].iloc[-1].day == 1), "m must be the first day of the month"
 
     return df
 
 
-def assert_invariants(df_before: pd.DataFrame, df_after: pd.DataFrame) -> None:
-    # same number of rows
-    assert len(df_after) == len(df_before), "Row count changed unexpectedly"
+def assert_invariants(n_rows_before: int, df_after: pd.DataFrame) -> None:
+    # same number of rows (counted before add_month_col, which works in place)
+    assert len(df_after) == n_rows_before, "Row count changed unexpectedly"
     # uniqueness preserved
     assert df_after.duplicated(["race_id", "constructor_id"]).sum() == 0, "Duplicates appeared"
     # dtype check for m
     assert pd.api.types.is_datetime64_any_dtype(df_after["m"]), "m must be datetime"
-    # first-day check
-    assert (df_after["m"].dt.day == 1).all(), "m must be first day of month"
+    # first-day spot check (first/last row only)
+    assert df_after.empty or (df_after["m"].iloc[0].day == 1 and df_after["m"].iloc[-1].day == 1), \
+        "m must be first day of month"
 
 
 def save(df: pd.DataFrame) -> Path:
+    """
+    Writes OUT sorted on m with dictionary-encoded constructor keys; df itself is left untouched.
+    The cast and sort run on the Arrow table that writing builds anyway, so beyond that table the
+    only extra copy is the reordered one, made only when m is not already sorted.
+    """
     OUT.parent.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(OUT, index=False)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # Sorted on m so row-group min/max stats on m are tight; row-group size stays at the pyarrow
+    # default (tiny per-month groups bloat the file). save_partitioned gives a month-aligned layout.
+    # Arrow's sort is stable, so rows within a month keep their source order.
+    if not df["m"].is_monotonic_increasing:
+        table = table.sort_by("m")
+    # Repeating keys are stored as dictionary columns (read back as pandas categoricals).
+    for col in ("constructor_id", "constructor_name"):
+        table = table.set_column(table.schema.get_field_index(col), col, table[col].dictionary_encode())
+    pq.write_table(table, OUT, compression="zstd", compression_level=3, use_dictionary=True)
     return OUT
 
 
+def save_partitioned(df: pd.DataFrame) -> Path:
+    """Writes one Hive-style m=YYYY-MM-DD/ directory per month in a single Arrow pass."""
+    assert "m" in df.columns, "m must be present before partitioning"
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # date32 is enough for a first-of-month key and keeps directory names as plain dates.
+    table = table.set_column(table.schema.get_field_index("m"), "m", table["m"].cast(pa.date32()))
+
+    # Months that vanished from the data would otherwise leave stale m=... directories behind.
+    shutil.rmtree(OUT_PARTITIONED, ignore_errors=True)
+    OUT_PARTITIONED.mkdir(parents=True, exist_ok=True)
+    ds.write_dataset(
+        table,
+        base_dir=str(OUT_PARTITIONED),
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([("m", pa.date32())]), flavor="hive"),
+        existing_data_behavior="delete_matching",
+        max_rows_per_file=1_000_000,
+        max_rows_per_group=1_000_000,
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd", compression_level=3),
+    )
+
+    n_parts = sum(1 for _ in OUT_PARTITIONED.glob("m=*"))
+    assert n_parts == df["m"].nunique(dropna=False), "Partition count does not match the months in df"
+    return OUT_PARTITIONED
+
+
+def save_streamed(path: Path, batch_size: int = 200_000) -> int:
+    """
+    Adds 'm' batch by batch and writes OUT without holding the whole table in memory.
+    (race_id, constructor_id) uniqueness spans batches, so it is left to the DuckDB dedupe in clean.py.
+    Returns the number of rows written.
+    """
+    src = pq.read_schema(path)
+    schema = pa.schema(
+        [pa.field("race_date", pa.timestamp("ns")) if c == "race_date" else src.field(c) for c in BRONZE_COLUMNS]
+        + [pa.field("m", pa.timestamp("ns"))]
+    )
+
+    n_rows = 0
+    OUT.parent.mkdir(parents=True, exist_ok=True)
+    with pq.ParquetWriter(OUT, schema, compression="zstd", compression_level=3) as writer:
+        for batch in load_bronze_batches(path, batch_size):
+            race_date = batch.column("race_date")
+            if race_date.type.tz is not None:
+                race_date = pc.local_timestamp(race_date)
+            race_date = race_date.cast(pa.timestamp("ns"))
+            m = pc.floor_temporal(race_date, unit="month")
+
+            columns = [race_date if c == "race_date" else batch.column(c) for c in BRONZE_COLUMNS]
+            writer.write_batch(pa.record_batch(columns + [m], schema=schema))
+            n_rows += batch.num_rows
+    return n_rows
+
+
 def main() -> None:
+    # Parses CLI flags: --partitioned also writes the by_month/ Hive layout
+    p = argparse.ArgumentParser()
+    p.add_argument("--partitioned", action="store_true", help="also write one m=YYYY-MM-DD/ directory per month")
+    args = p.parse_args()
+
+    n_rows = pq.ParquetFile(INP).metadata.num_rows
+    if n_rows > STREAM_MIN_ROWS:
+        if args.partitioned:
+            raise SystemExit(f"--partitioned needs the in-memory path (bronze has more than {STREAM_MIN_ROWS} rows).")
+        written = save_streamed(INP)
+        assert written == n_rows, "Row count changed unexpectedly"
+        print(f"rows={written} (streamed)")
+        print("Saved ->", OUT)
+        return
+
     before = load_bronze(INP)
-    after = add_month_col(before.copy())
-    assert_invariants(before, after)
+    n_rows_before = len(before)
+    after = add_month_col(before)
+    assert_invariants(n_rows_before, after)
 
     n_months = after["m"].nunique()
     print(f"rows={len(after)} months={n_months} range={after['m'].min()} → {after['m'].max()}")
@@ -65,6 +177,9 @@ def main() -> None:
     out = save(after)
     print("Saved ->", out)
 
+    if args.partitioned:
+        print("Saved ->", save_partitioned(after))
+
 
 if __name__ == "__main__":
     main()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from pathlib import Path
+import duckdb
 import pandas as pd
 
 ROOT = Path(__file__).resolve().parents[2]
@@ -30,11 +31,14 @@ def _ensure_datetime(series: pd.Series) -> pd.Series:
 def _ensure_month(df: pd.DataFrame) -> pd.DataFrame:
     """Adds/normalizes the month column 'm' (first day of month, datetime64[ns])."""
     if "m" in df.columns:
-        df["m"] = pd.to_datetime(df["m"], errors="raise")
+        # Only parse when needed; m from add_month_col is already datetime64.
+        if not pd.api.types.is_datetime64_any_dtype(df["m"]):
+            df["m"] = pd.to_datetime(df["m"], errors="raise")
     else:
-        df["m"] = df["race_date"].dt.to_period("M").dt.to_timestamp(how="start")
+        df["m"] = df["race_date"].to_numpy("datetime64[ns]").astype("datetime64[M]").astype("datetime64[ns]")
     assert pd.api.types.is_datetime64_any_dtype(df["m"]), "m must be datetime64[ns]"
-    assert (df["m"].dt.day == 1).all(), "m must be the first day of the month"
+    # O(1) sanity check; the datetime64[M] floor already guarantees day 1 for every row.
+    assert df.empty or (df["m"].iloc[0].day == 1 and df["m"].iloc[-1].day == 1), "m must be the first day of the month"
     return df
 
 
@@ -45,7 +49,9 @@ def _dedupe_by_pair(df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
     Returns the cleaned df and number of rows dropped.
     """
     before = len(df)
-    df = df.sort_values(["race_id", "constructor_id", "points"], ascending=[True, True, False])
+    # Stable sort on points alone: among equal points the earlier source row wins.
+    # The returned rows are ordered by points (descending), not by (race_id, constructor_id).
+    df = df.sort_values("points", ascending=False, kind="stable")
     df = df.drop_duplicates(subset=["race_id", "constructor_id"], keep="first")
     dropped = before - len(df)
     assert df.duplicated(["race_id", "constructor_id"]).sum() == 0, "Duplicates remain after dedupe"
@@ -73,28 +79,92 @@ def _clean_values(df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
 
 
 # ---------- Main pipeline function ----------
-def main() -> None:
-    """Builds the SILVER table from BRONZE with clear quality logs."""
-    inp = INP_WITH_MONTH if INP_WITH_MONTH.exists() else INP_NO_MONTH
-    df = pd.read_parquet(inp)
-
-    _expect_columns(df, {"race_id", "race_date", "constructor_id", "constructor_name", "points"})
-    df["race_date"] = _ensure_datetime(df["race_date"])
-
-    df = _ensure_month(df)
+# Dedupe on the raw points (highest wins, NULL last, earlier file row breaks ties) and floor race_date to the month.
+# The file_row_number tiebreak makes the pick deterministic, matching the old stable sort.
+# raw_points is kept so quality counts are taken on the deduped rows, before negatives are nulled.
+DEDUPED_QUERY = """
+    SELECT
+      race_id,
+      race_date,
+      date_trunc('month', race_date) AS m,
+      constructor_id,
+      constructor_name,
+      raw_points
+    FROM (
+      SELECT
+        race_id,
+        CAST(race_date AS TIMESTAMP) AS race_date,
+        constructor_id,
+        constructor_name,
+        TRY_CAST(points AS DOUBLE) AS raw_points,
+        file_row_number
+      FROM read_parquet($1, file_row_number = true)
+    )
+    QUALIFY row_number() OVER (
+      PARTITION BY race_id, constructor_id ORDER BY raw_points DESC NULLS LAST, file_row_number
+    ) = 1
+"""
 
-    df, dropped = _dedupe_by_pair(df)
-
-    df, issues = _clean_values(df)
-
-    df = df[["race_id", "race_date", "m", "constructor_id", "constructor_name", "points"]]
 
+def main() -> None:
+    """Builds the SILVER table from BRONZE in one DuckDB pass, with clear quality logs."""
+    inp = INP_WITH_MONTH if INP_WITH_MONTH.exists() else INP_NO_MONTH
+    con = duckdb.connect(database=":memory:")
+
+    n_in = con.execute("SELECT count(*) FROM read_parquet($1)", [str(inp)]).fetchone()[0]
+    con.execute(f"CREATE TEMP TABLE deduped AS {DEDUPED_QUERY}", [str(inp)])
+
+    # Regression guard: every kept row must carry its pair's highest raw points (NULL only if all are NULL).
+    wrong_pick = con.execute("""
+        SELECT count(*)
+        FROM deduped AS d
+        JOIN (
+          SELECT race_id, constructor_id, max(TRY_CAST(points AS DOUBLE)) AS best
+          FROM read_parquet($1)
+          GROUP BY race_id, constructor_id
+        ) AS b USING (race_id, constructor_id)
+        WHERE d.raw_points IS DISTINCT FROM b.best
+    """, [str(inp)]).fetchone()[0]
+    assert wrong_pick == 0, f"Dedupe kept a non-max row for {wrong_pick} (race_id, constructor_id) pairs"
+
+    rows, n_months, m_min, m_max, neg_points, missing_points, missing_name = con.execute("""
+        SELECT
+          count(*),
+          count(DISTINCT m),
+          min(m),
+          max(m),
+          count(*) FILTER (WHERE raw_points < 0),
+          count(*) FILTER (WHERE raw_points IS NULL OR raw_points < 0),
+          count(*) FILTER (WHERE constructor_name IS NULL)
+        FROM deduped
+    """).fetchone()
+    issues = {
+        "neg_points_found": neg_points,
+        "missing_points": missing_points,
+        "missing_constructor_name": missing_name,
+    }
+
+    # Negative points become NULL. Sorted on (m, race_id, constructor_id): m, race_date and race_id then rise
+    # together, which compresses best, and row groups get tight min/max stats on m for month filters.
     OUT_SILVER.parent.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(OUT_SILVER, index=False)
+    con.execute(f"""
+        COPY (
+          SELECT
+            race_id,
+            race_date,
+            m,
+            constructor_id,
+            constructor_name,
+            CASE WHEN raw_points < 0 THEN NULL ELSE raw_points END AS points
+          FROM deduped
+          ORDER BY m, race_id, constructor_id
+        ) TO '{OUT_SILVER.as_posix()}'
+        (FORMAT PARQUET, COMPRESSION ZSTD, COMPRESSION_LEVEL 3)
+    """)
 
     print(f"Loaded from: {inp}")
-    print(f"Rows after dedupe: {len(df)}  (dropped={dropped})")
-    print(f"Months: {df['m'].nunique()}  range: {df['m'].min()} → {df['m'].max()}")
+    print(f"Rows after dedupe: {rows}  (dropped={n_in - rows})")
+    print(f"Months: {n_months}  range: {m_min} → {m_max}")
     for k, v in issues.items():
         print(f"{k}: {v}")
     print("Saved ->", OUT_SILVER)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+from pathlib import Path
+import polars as pl
+
+# ---------- Paths ----------
+ROOT = Path(__file__).resolve().parents[2]
+BRONZE = ROOT / "data" / "bronze"
+INP_WITH_MONTH = BRONZE / "race_constructor_points_with_month.parquet"
+INP_NO_MONTH = BRONZE / "race_constructor_points.parquet"
+GOLD = ROOT / "data" / "gold" / "constructor_monthly.parquet"
+GOLD.parent.mkdir(parents=True, exist_ok=True)
+
+
+def build_gold(inp: Path) -> pl.LazyFrame:
+    """
+    Bronze -> gold as one lazy Polars plan, mirroring clean.py (silver) and sql.py (gold).
+    Nothing runs until the plan is collected or sunk.
+    """
+    silver = (
+        pl.scan_parquet(inp)
+        .select(
+            "race_id",
+            pl.col("race_date").cast(pl.Datetime("ns")),
+            "constructor_id",
+            "constructor_name",
+            pl.col("points").cast(pl.Float64, strict=False),
+        )
+        # Dedupe (race_id, constructor_id): highest raw points wins, nulls last, source order breaks ties.
+        .sort("points", descending=True, nulls_last=True, maintain_order=True)
+        .unique(subset=["race_id", "constructor_id"], keep="first", maintain_order=True)
+        .with_columns(
+            pl.when(pl.col("points") < 0).then(None).otherwise(pl.col("points")).alias("points"),
+            pl.col("race_date").dt.truncate("1mo").alias("m"),
+        )
+    )
+
+    # One row per (constructor_id, m); like SQL SUM, a month with only null points stays null.
+    monthly = (
+        silver
+        .group_by("constructor_id", "constructor_name", "m")
+        .agg(
+            pl.when(pl.col("points").is_null().all())
+            .then(None)
+            .otherwise(pl.col("points").sum())
+            .alias("points_m")
+        )
+        # shift().over() takes the previous row within each constructor, so rows must be in m order first.
+        .sort("constructor_id", "m")
+    )
+
+    # MoM vs the previous month of the same constructor; NULL (not 0) when there is no usable baseline.
+    prev = pl.col("points_m").shift(1).over("constructor_id")
+    return (
+        monthly
+        .with_columns(
+            pl.when(prev.is_null() | (prev == 0))
+            .then(None)
+            .otherwise((pl.col("points_m") - prev) / prev)
+            .alias("mom_growth")
+        )
+        # Same column types as the DuckDB gold from sql.py, so readers see one schema whichever builder ran.
+        .select(
+            pl.col("constructor_id").cast(pl.Int64),
+            pl.col("constructor_name").cast(pl.String),
+            pl.col("m").cast(pl.Datetime("us")),
+            pl.col("points_m").cast(pl.Float64),
+            pl.col("mom_growth").cast(pl.Float64),
+        )
+        .sort("m", "constructor_id")
+    )
+
+
+# ---------- Main ----------
+def main() -> None:
+    inp = INP_WITH_MONTH if INP_WITH_MONTH.exists() else INP_NO_MONTH
+    build_gold(inp).sink_parquet(GOLD, compression="zstd", compression_level=3, row_group_size=100_000)
+
+    stats = pl.scan_parquet(GOLD).select(
+        pl.len().alias("rows"),
+        pl.struct("constructor_id", "m").n_unique().alias("keys"),
+        pl.col("m").min().alias("m_min"),
+        pl.col("m").max().alias("m_max"),
+        pl.col("m").n_unique().alias("months"),
+    ).collect().row(0, named=True)
+
+    print(f"Loaded from: {inp}")
+    print("Gold rows:", stats["rows"])
+    print("Unique keys:", stats["keys"])
+    print("Months:", stats["m_min"], "→", stats["m_max"], "| n_unique:", stats["months"])
+    print("Saved ->", GOLD)
+
+
+if __name__ == "__main__":
+    main()
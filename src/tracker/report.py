@@ -1,5 +1,6 @@
 from __future__ import annotations
 from pathlib import Path
+from functools import lru_cache
 import argparse
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -10,47 +11,81 @@ GOLD = ROOT / "data" / "gold" / "constructor_monthly.parquet"
 OUTDIR = ROOT / "reports" / "charts"
 OUTDIR.mkdir(parents=True, exist_ok=True)
 
+# ---------- Chart settings ----------
+FIGSIZE = (8, 5)
+DPI = 160
 
-def load_gold() -> pd.DataFrame:
-    """Loads gold and normalizes types."""
-    df = pd.read_parquet(GOLD)
+# Figure reused by render_one across calls in the same process.
+_canvas: tuple[plt.Figure, plt.Axes] | None = None
+
+
+@lru_cache(maxsize=None)
+def load_gold(path: Path = GOLD) -> pd.DataFrame:
+    """Loads gold and normalizes types. Cached per path, so each process reads the file once."""
+    df = pd.read_parquet(path)
     df["m"] = pd.to_datetime(df["m"])
     return df
 
 
-def plot_topk_for_month(df: pd.DataFrame, ym: str, k: int = 10) -> Path:
+def render_month(ax: plt.Axes, df: pd.DataFrame, ym: str, top: int = 10) -> None:
     """
-    Creates a horizontal bar chart of top-K constructors by points for a given month.
+    Draws the top-K constructors by points for a given month onto an existing Axes.
     ym: 'YYYY-MM' (e.g., '2012-08' or '1993-04').
-    Returns the path to the saved PNG.
     """
     # Converts 'YYYY-MM' to the canonical first-of-month timestamp used in gold.
     month = pd.to_datetime(ym + "-01")
 
     # Filters to the selected month; picks the top K by points_m.
-    sub = (df[df["m"] == month].nlargest(k, "points_m")[["constructor_name", "points_m"]])
+    sub = (df[df["m"] == month].nlargest(top, "points_m")[["constructor_name", "points_m"]])
 
     # If the month has no rows (e.g., no races), gives a helpful error early.
     if sub.empty:
         raise SystemExit(f"No data for month {ym}. Try another month shown in gold.")
 
-    # Builds the chart; sorts ascending so the biggest bar appears at the top.
-    fig, ax = plt.subplots(figsize=(8, 5))
+    # Sorts ascending so the biggest bar appears at the top.
     sub.sort_values("points_m").plot(
         kind="barh", x="constructor_name", y="points_m",
         ax=ax, legend=False
     )
-    ax.set_title(f"Top {k} Constructors — {ym}")
+    ax.set_title(f"Top {top} Constructors — {ym}")
     ax.set_xlabel("Points in Month")
 
+
+def plot_topk_for_month(df: pd.DataFrame, ym: str, k: int = 10) -> Path:
+    """
+    Creates a horizontal bar chart of top-K constructors by points for a given month.
+    Returns the path to the saved PNG.
+    """
+    fig, ax = plt.subplots(figsize=FIGSIZE)
+    render_month(ax, df, ym, k)
+
     # Saves chart into reports/charts with a consistent name.
     out = OUTDIR / f"top10_{ym}.png"
     fig.tight_layout()
-    fig.savefig(out, dpi=160)
+    fig.savefig(out, dpi=DPI)
     plt.close(fig)
     return out
 
 
+def render_one(ym: str, gold_path: Path = GOLD, charts_dir: Path = OUTDIR, top: int = 10) -> Path:
+    """
+    Renders and saves the chart for one month; usable as a process-pool task.
+    Gold and the figure are created once per process and reused across calls.
+    """
+    global _canvas
+    if _canvas is None:
+        _canvas = plt.subplots(figsize=FIGSIZE)
+    fig, ax = _canvas
+
+    ax.clear()
+    render_month(ax, load_gold(gold_path), ym, top)
+
+    out = charts_dir / f"top10_{ym}.png"
+    fig.tight_layout()
+    fig.savefig(out, dpi=DPI)
+    return out
+
+
 def main() -> None:
     # Parses CLI flags: --month 2012-08 --top 10
     p = argparse.ArgumentParser()